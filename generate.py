@@ -4,26 +4,67 @@ Compare animated SVG generation across multiple AI models via OpenRouter.
 Caches results to avoid re-calling models that already succeeded.
 """
 
+import base64
+import gzip
+import hashlib
+import http.client
 import json
+import logging
 import os
+import queue
+import random
 import re
+import shutil
+import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError
+from html import escape
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
 import subprocess
 API_KEY = os.environ.get("OPENROUTER_API_KEY") or subprocess.check_output(
     ["secrets", "get", "OPENROUTER_API_KEY"], text=True
 ).strip()
 API_URL = "https://openrouter.ai/api/v1/chat/completions"
-CACHE_PATH = os.path.join(os.path.dirname(__file__), "cache.json")
+_API = urlsplit(API_URL)
+_FENCE_RE = re.compile(r"```(?:svg|xml|html)?\s*\n?")
+# ASCII-only lowercasing; unlike str.lower() it never changes the length,
+# so indices found in the lowered text are valid in the original
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# A path ending in .gz stores the cache gzip-compressed; relative paths are
+# taken from the script's directory, like the default
+CACHE_PATH = os.path.join(_HERE, os.environ.get("GEN_CACHE") or "cache.json")
+# Calls are network-bound, so size the pool for concurrent requests, not CPUs
+MAX_WORKERS = max(1, int(os.environ.get("GEN_WORKERS", "20")))
+# Keep one idle keep-alive connection per worker
+POOL_MAXSIZE = MAX_WORKERS
+# OpenRouter rate-limits per upstream provider; cap concurrent calls to each
+PROVIDER_CONCURRENCY = 4
+# Transient statuses retried with exponential backoff, up to MAX_ATTEMPTS tries
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 5
+# Longest server-requested Retry-After wait honored, in seconds
+MAX_RETRY_AFTER = 300
 
 PROMPT = """Create an animated SVG image of a pelican riding a bicycle.
 The pelican should be pedaling and the wheels should be spinning.
 Use SVG animations (animate, animateTransform, etc).
 Output ONLY the SVG code, nothing else. No markdown fences, no explanation.
 Start with <svg and end with </svg>."""
+MAX_TOKENS = 16000
+TEMPERATURE = 0.7
+
+# Everything in the request body except "model" is the same for every call,
+# so serialize it once; call_model splices the model id in front.
+_PAYLOAD_TAIL = json.dumps({
+    "messages": [{"role": "user", "content": PROMPT}],
+    "max_tokens": MAX_TOKENS,
+    "temperature": TEMPERATURE,
+})[1:].encode()
 
 # (display_name, model_id, release_date_str)
 MODELS = [
@@ -71,6 +112,9 @@ MODELS = [
     ("Qwen 2.5 7B", "qwen/qwen-2.5-7b-instruct", "Oct 2024"),
 ]
 
+MODEL_DATES = {name: date for name, _, date in MODELS}
+MODEL_MAP = {name: mid for name, mid, _ in MODELS}
+
 # Categories: newest first within each section, older SOTA models at the end
 CATEGORIES = [
     ("Anthropic (current + historical)", [
@@ -103,182 +147,89 @@ CATEGORIES = [
     ]),
 ]
 
+# CATEGORIES restricted to names actually in MODELS, so rendering never
+# looks up a model that can't have a result
+_VALID_CATEGORY_NAMES = [(cat, tuple(n for n in names if n in MODEL_MAP)) for cat, names in CATEGORIES]
 
-def load_cache():
-    if os.path.exists(CACHE_PATH):
-        with open(CACHE_PATH) as f:
-            return json.load(f)
-    return {}
-
-
-def save_cache(cache):
-    with open(CACHE_PATH, "w") as f:
-        json.dump(cache, f)
-
-
-def call_model(name, model_id):
-    """Call a single model and return (name, svg_output, elapsed, error)."""
-    print(f"  [{name}] Requesting...", flush=True)
-    start = time.time()
-    payload = json.dumps({
-        "model": model_id,
-        "messages": [{"role": "user", "content": PROMPT}],
-        "max_tokens": 16000,
-        "temperature": 0.7,
-    }).encode()
-
-    req = Request(API_URL, data=payload, method="POST")
-    req.add_header("Authorization", f"Bearer {API_KEY}")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("HTTP-Referer", "https://localhost")
-
-    try:
-        with urlopen(req, timeout=300) as resp:
-            data = json.loads(resp.read())
-        elapsed = time.time() - start
-        content = data["choices"][0]["message"]["content"]
-        # Strip markdown fences if present
-        content = re.sub(r"```(?:svg|xml|html)?\s*\n?", "", content)
-        content = content.replace("```", "")
-        svg_match = re.search(r"(<svg[\s\S]*?</svg>)", content, re.IGNORECASE)
-        if svg_match:
-            svg = svg_match.group(1)
-            print(f"  [{name}] Done in {elapsed:.1f}s ({len(svg)} chars)", flush=True)
-            return name, svg, elapsed, None
-        else:
-            print(f"  [{name}] Done in {elapsed:.1f}s but no SVG found", flush=True)
-            return name, None, elapsed, "No <svg> tag found in response"
-    except HTTPError as e:
-        elapsed = time.time() - start
-        body = e.read().decode() if e.fp else ""
-        print(f"  [{name}] Error: {e.code} in {elapsed:.1f}s", flush=True)
-        return name, None, elapsed, f"HTTP {e.code}: {body[:200]}"
-    except Exception as e:
-        elapsed = time.time() - start
-        print(f"  [{name}] Error: {e} in {elapsed:.1f}s", flush=True)
-        return name, None, elapsed, str(e)
-
-
-def build_html(results, model_dates):
-    """Build comparison HTML from results dict."""
-    sections_html = []
-    for cat_name, model_names in CATEGORIES:
-        cards_html = []
-        for name in model_names:
-            r = results.get(name)
-            if not r:
-                continue
-            svg, elapsed, error = r
-            date = model_dates.get(name, "")
-            if error:
-                content = f'<div class="error">Error: {error}</div>'
-            else:
-                content = f'<div class="svg-container">{svg}</div>'
-            cards_html.append(f"""
-            <div class="card">
-                <div class="card-header">
-                    <div>
-                        <h3>{name}</h3>
-                        <span class="release">Released: {date}</span>
-                    </div>
-                    <span class="time">{elapsed:.1f}s</span>
-                </div>
-                {content}
-            </div>""")
-
-        sections_html.append(f"""
-        <section>
-            <h2>{cat_name}</h2>
-            <div class="grid">{"".join(cards_html)}</div>
-        </section>""")
-
-    total = len(results)
-    success = sum(1 for v in results.values() if v[2] is None)
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<title>Animated SVG Model Comparison - Pelican Riding a Bicycle</title>
-<style>
-    * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-    body {{
+# Stylesheet inlined into the generated page
+CSS = """    * { margin: 0; padding: 0; box-sizing: border-box; }
+    body {
         font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
         background: #0a0a0a;
         color: #e0e0e0;
         padding: 2rem;
-    }}
-    h1 {{
+    }
+    h1 {
         text-align: center;
         margin-bottom: 0.5rem;
         font-size: 1.8rem;
         color: #fff;
-    }}
-    .subtitle {{
+    }
+    .subtitle {
         text-align: center;
         color: #888;
         margin-bottom: 2rem;
         font-size: 0.9rem;
         line-height: 1.6;
-    }}
-    section {{
+    }
+    section {
         margin-bottom: 2.5rem;
-    }}
-    h2 {{
+    }
+    h2 {
         font-size: 1.3rem;
         color: #aaa;
         border-bottom: 1px solid #333;
         padding-bottom: 0.5rem;
         margin-bottom: 1rem;
-    }}
-    .grid {{
+    }
+    .grid {
         display: grid;
         grid-template-columns: repeat(auto-fill, minmax(380px, 1fr));
         gap: 1.5rem;
-    }}
-    .card {{
+    }
+    .card {
         background: #1a1a1a;
         border: 1px solid #333;
         border-radius: 8px;
         overflow: hidden;
-    }}
-    .card-header {{
+    }
+    .card-header {
         display: flex;
         justify-content: space-between;
         align-items: center;
         padding: 0.75rem 1rem;
         background: #222;
         border-bottom: 1px solid #333;
-    }}
-    .card-header h3 {{
+    }
+    .card-header h3 {
         font-size: 0.95rem;
         color: #fff;
-    }}
-    .release {{
+    }
+    .release {
         font-size: 0.75rem;
         color: #666;
-    }}
-    .time {{
+    }
+    .time {
         font-size: 0.8rem;
         color: #888;
         background: #2a2a2a;
         padding: 2px 8px;
         border-radius: 4px;
         white-space: nowrap;
-    }}
-    .svg-container {{
+    }
+    .svg-container {
         padding: 1rem;
         display: flex;
         justify-content: center;
         align-items: center;
         min-height: 350px;
         background: #fff;
-    }}
-    .svg-container svg {{
+    }
+    .svg-container svg {
         max-width: 100%;
         max-height: 400px;
-    }}
-    .error {{
+    }
+    .error {
         padding: 1.5rem;
         color: #f44;
         font-size: 0.85rem;
@@ -287,8 +238,294 @@ def build_html(results, model_dates):
         align-items: center;
         justify-content: center;
         text-align: center;
-    }}
-</style>
+    }
+"""
+
+
+def cache_key(model_id):
+    """Cache key for a request: hash of everything that affects the response."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (model_id, PROMPT, str(MAX_TOKENS), str(TEMPERATURE)):
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _open_cache(path, mode, compressed):
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode)
+
+
+def load_cache():
+    compressed = CACHE_PATH.endswith(".gz")
+    if os.path.exists(CACHE_PATH):
+        with _open_cache(CACHE_PATH, "r", compressed) as f:
+            return json.load(f)
+    # First run against a new .gz cache: seed it from the plain cache.json
+    # next to it instead of re-calling every model
+    if compressed and os.path.exists(CACHE_PATH[:-3]):
+        with _open_cache(CACHE_PATH[:-3], "r", False) as f:
+            return json.load(f)
+    return {}
+
+
+def migrate_cache(cache):
+    """Re-key legacy display-name entries to cache_key(); return True if any moved.
+
+    Legacy entries were generated with the current prompt and settings, so
+    they are filed under today's key. Names no longer in MODELS are left alone.
+    """
+    moved = False
+    for name in [name for name in cache if name in MODEL_MAP]:
+        entry = cache.pop(name)
+        cache.setdefault(cache_key(MODEL_MAP[name]), {"name": name, **entry})
+        moved = True
+    return moved
+
+
+def save_cache(cache):
+    # Write to a temp file and swap it in, so a crash mid-write never
+    # leaves a truncated cache.json behind
+    tmp = CACHE_PATH + ".tmp"
+    try:
+        with _open_cache(tmp, "w", CACHE_PATH.endswith(".gz")) as f:
+            json.dump(cache, f)
+        os.replace(tmp, CACHE_PATH)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def cache_writer(cache, updates, errors):
+    """Apply {key: entry} dicts from the updates queue to cache and save it; stops on None.
+
+    A failed save is appended to errors for the caller to re-raise; the queue
+    keeps being drained (and later saves retried) so producers never stall.
+    """
+    while True:
+        batch = [updates.get()]
+        # Fold in anything else already queued so a burst costs one save
+        while True:
+            try:
+                batch.append(updates.get_nowait())
+            except queue.Empty:
+                break
+        entries = [item for item in batch if item is not None]
+        for item in entries:
+            cache.update(item)
+        if entries:
+            try:
+                save_cache(cache)
+            except Exception as e:
+                errors.append(e)
+        if len(entries) < len(batch):
+            return
+
+
+def coalesce_groups(to_call, lanes=PROVIDER_CONCURRENCY):
+    """Group {name: model_id} by provider: [(provider, [(name, model_id), ...]), ...].
+
+    Each provider's models are dealt round-robin into at most `lanes` groups,
+    which bounds how many requests hit one provider at a time.
+    """
+    by_provider = {}
+    for name, mid in to_call.items():
+        by_provider.setdefault(mid.split("/")[0], []).append((name, mid))
+    return [(provider, entries[i::lanes])
+            for provider, entries in by_provider.items()
+            for i in range(min(lanes, len(entries)))]
+
+
+# Module-level pool of keep-alive HTTPS connections to OpenRouter, shared by
+# all workers so the TLS handshake is paid once per connection, not per model.
+_pool = queue.LifoQueue(maxsize=POOL_MAXSIZE)
+
+
+def _connect():
+    """New HTTPS connection to the API, tunnelled through HTTPS_PROXY if set."""
+    proxy = getproxies().get("https")
+    if not proxy or proxy_bypass(_API.hostname):
+        return http.client.HTTPSConnection(_API.hostname, timeout=300)
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    proxy = urlsplit(proxy)
+    conn = http.client.HTTPSConnection(proxy.hostname, proxy.port or 80, timeout=300)
+    tunnel_headers = {}
+    if proxy.username:
+        creds = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+        tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+    conn.set_tunnel(_API.hostname, _API.port or 443, headers=tunnel_headers)
+    return conn
+
+
+def _acquire():
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _connect()
+
+
+def _release(conn):
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def _post(conn, payload, headers):
+    """POST to the API over conn; return the response, body not yet read."""
+    while True:
+        reused = conn.sock is not None
+        try:
+            conn.request("POST", _API.path, body=payload, headers=headers)
+            return conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            conn.close()
+            # Only a stale idle keep-alive socket is safe to resend on (the
+            # loop comes back with a fresh one); a failure on a new connection
+            # may have reached the model and been billed, so don't repeat it
+            if not reused:
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+
+# Worker progress goes through a queue; a listener thread does the actual
+# stdout writes, so workers never block on the stdout lock
+log = logging.getLogger("generate")
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.Queue()
+log.addHandler(QueueHandler(_log_queue))
+_log_stdout = logging.StreamHandler(sys.stdout)
+_log_stdout.setFormatter(logging.Formatter("  %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stdout)
+
+
+def _retry_delay(headers, attempt):
+    """Seconds to wait before retry number attempt + 1.
+
+    A numeric Retry-After is honored up to MAX_RETRY_AFTER; otherwise back
+    off exponentially with jitter, capped at 30s.
+    """
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(headers.get("Retry-After"))))
+    except (TypeError, ValueError):
+        return min(30, 2 ** attempt + random.random())
+
+
+def call_model(name, model_id, conn):
+    """Call a single model and return (name, svg_output, elapsed, error)."""
+    log.info("[%s] Requesting...", name)
+    start = time.time()
+    payload = b'{"model": ' + json.dumps(model_id).encode() + b", " + _PAYLOAD_TAIL
+
+    headers = {
+        "Authorization": f"Bearer {API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://localhost",
+    }
+
+    try:
+        for attempt in range(MAX_ATTEMPTS):
+            resp = _post(conn, payload, headers)
+            if resp.status not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                break
+            resp.read()  # drain so the connection can be reused
+            delay = _retry_delay(resp.headers, attempt)
+            log.info("[%s] HTTP %s, retrying in %.1fs", name, resp.status, delay)
+            time.sleep(delay)
+            start = time.time()
+        if resp.status != 200:
+            body = resp.read()
+            elapsed = time.time() - start
+            log.info("[%s] Error: %s in %.1fs", name, resp.status, elapsed)
+            return name, None, elapsed, f"HTTP {resp.status}: {body.decode(errors='replace')[:200]}"
+        content = json.load(resp)["choices"][0]["message"]["content"]
+        elapsed = time.time() - start
+        # Strip markdown fences if present
+        content = _FENCE_RE.sub("", content)
+        content = content.replace("```", "")
+        # Outermost <svg ...>...</svg>, case-insensitive, without regex backtracking
+        lower = content.translate(_ASCII_LOWER)
+        i = lower.find("<svg")
+        j = lower.rfind("</svg>")
+        if i != -1 and j > i:
+            svg = content[i:j + 6]
+            log.info("[%s] Done in %.1fs (%d chars)", name, elapsed, len(svg))
+            return name, svg, elapsed, None
+        else:
+            log.info("[%s] Done in %.1fs but no SVG found", name, elapsed)
+            return name, None, elapsed, "No <svg> tag found in response"
+    except Exception as e:
+        # The response may be half-read; drop the socket rather than reuse it
+        conn.close()
+        elapsed = time.time() - start
+        log.info("[%s] Error: %s in %.1fs", name, e, elapsed)
+        return name, None, elapsed, str(e)
+
+
+def call_group(entries, on_result=None):
+    """Call each (name, model_id) in turn over one connection; return a list of call_model results.
+
+    on_result, if given, is called with each result as soon as it arrives.
+    """
+    conn = _acquire()
+    try:
+        results = []
+        for name, mid in entries:
+            result = call_model(name, mid, conn)
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
+    finally:
+        _release(conn)
+
+
+# Model name -> Future of the call_group currently fetching it, so a model
+# that is already being requested is never sent a second time
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def dispatch(pool, entries, on_result=None):
+    """Submit call_group for entries not already in flight; return the futures covering all of entries."""
+    with _INFLIGHT_LOCK:
+        futures = {_INFLIGHT[name] for name, _ in entries if name in _INFLIGHT}
+        fresh = [(name, mid) for name, mid in entries if name not in _INFLIGHT]
+        if not fresh:
+            return futures
+        future = pool.submit(call_group, fresh, on_result)
+        for name, _ in fresh:
+            _INFLIGHT[name] = future
+
+    def clear(done):
+        with _INFLIGHT_LOCK:
+            for name, _ in fresh:
+                if _INFLIGHT.get(name) is done:
+                    del _INFLIGHT[name]
+
+    future.add_done_callback(clear)
+    futures.add(future)
+    return futures
+
+
+def write_html(results, model_dates, fp):
+    """Stream comparison HTML for results dict to the open file fp."""
+    total = len(results)
+    success = sum(1 for v in results.values() if v[2] is None)
+
+    fp.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Animated SVG Model Comparison - Pelican Riding a Bicycle</title>
+<style>
+{CSS}</style>
 </head>
 <body>
 <h1>Animated SVG: Pelican Riding a Bicycle</h1>
@@ -296,55 +533,106 @@ def build_html(results, model_dates):
     Same prompt sent to {total} models via OpenRouter ({success} returned valid SVG)<br>
     Generated {time.strftime('%Y-%m-%d %H:%M')}
 </p>
-{"".join(sections_html)}
+""")
+    for cat_name, model_names in _VALID_CATEGORY_NAMES:
+        fp.write(f"""
+        <section>
+            <h2>{escape(cat_name)}</h2>
+            <div class="grid">""")
+        for name in model_names:
+            r = results.get(name)
+            if not r:
+                continue
+            svg, elapsed, error = r
+            date = model_dates.get(name, "")
+            fp.write(f"""
+            <div class="card">
+                <div class="card-header">
+                    <div>
+                        <h3>{escape(name)}</h3>
+                        <span class="release">Released: {escape(date)}</span>
+                    </div>
+                    <span class="time">{elapsed:.1f}s</span>
+                </div>
+                """)
+            # Write the SVG payload straight through rather than copying it
+            # into an intermediate string; it is markup, so it isn't escaped
+            if error:
+                fp.write(f'<div class="error">Error: {escape(error)}</div>')
+            else:
+                fp.write('<div class="svg-container">')
+                fp.write(svg)
+                fp.write('</div>')
+            fp.write("""
+            </div>""")
+        fp.write("""</div>
+        </section>""")
+    fp.write("""
 </body>
-</html>"""
-    return html
+</html>""")
 
 
 def main():
-    model_dates = {name: date for name, _, date in MODELS}
-    model_map = {name: mid for name, mid, _ in MODELS}
-
     # Load cache of previous successful results
     cache = load_cache()
-    results = {}
-    to_call = {}
+    if migrate_cache(cache):
+        save_cache(cache)
+    keys = {name: cache_key(mid) for name, mid in MODEL_MAP.items()}
+    cached_names = {name for name, key in keys.items() if cache.get(key, {}).get("svg")}
+    results = {name: (cache[keys[name]]["svg"], cache[keys[name]]["elapsed"], None)
+               for name in MODEL_MAP if name in cached_names}
+    to_call = {name: mid for name, mid in MODEL_MAP.items() if name not in cached_names}
 
-    for name, mid in model_map.items():
-        if name in cache and cache[name].get("svg"):
-            print(f"  [{name}] Using cached result", flush=True)
-            results[name] = (cache[name]["svg"], cache[name]["elapsed"], None)
-        else:
-            to_call[name] = mid
+    print(f"Cached: {len(results)}  To call: {len(to_call)}", flush=True)
 
     if to_call:
-        print(f"Calling {len(to_call)} models ({len(results)} cached)...", flush=True)
-        with ThreadPoolExecutor(max_workers=6) as pool:
-            futures = {pool.submit(call_model, name, mid): name for name, mid in to_call.items()}
-            for future in as_completed(futures):
-                name, svg, elapsed, error = future.result()
-                results[name] = (svg, elapsed, error)
-                if svg and not error:
-                    cache[name] = {"svg": svg, "elapsed": elapsed}
-        save_cache(cache)
-    else:
-        print("All models cached, building HTML...", flush=True)
+        # Saves run on a background thread so workers never wait on disk
+        updates = queue.Queue()
+        save_errors = []
+        writer = threading.Thread(target=cache_writer, args=(cache, updates, save_errors), daemon=True)
+        writer.start()
+
+        def persist(result):
+            # Save each success immediately so a killed run keeps what it paid for
+            name, svg, elapsed, error = result
+            if svg and not error:
+                updates.put({keys[name]: {"name": name, "svg": svg, "elapsed": elapsed}})
+
+        groups = coalesce_groups(to_call)
+        _log_listener.start()
+        try:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(groups))) as pool:
+                futures = set()
+                for _, entries in groups:
+                    futures |= dispatch(pool, entries, persist)
+                for future in as_completed(futures):
+                    for name, svg, elapsed, error in future.result():
+                        results[name] = (svg, elapsed, error)
+        finally:
+            updates.put(None)
+            writer.join()
+            _log_listener.stop()
+        if save_errors:
+            raise save_errors[0]
 
     print(f"\nBuilding HTML...", flush=True)
-    html = build_html(results, model_dates)
-    out_path = os.path.join(os.path.dirname(__file__), "index.html")
+    out_path = os.path.join(_HERE, "index.html")
     with open(out_path, "w") as f:
-        f.write(html)
+        write_html(results, MODEL_DATES, f)
+    # Pre-compressed copy for servers/CDNs that serve .gz directly
+    with open(out_path, "rb") as src, gzip.open(out_path + ".gz", "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
     print(f"Output: {out_path}")
 
     success = sum(1 for v in results.values() if v[2] is None)
     print(f"\nResults: {success}/{len(results)} models returned valid SVG")
-    for name in model_map:
+    lines = []
+    for name in MODEL_MAP:
         if name in results:
             svg, elapsed, error = results[name]
             status = "OK" if not error else f"FAIL: {error[:60]}"
-            print(f"  {name:25s} {elapsed:6.1f}s  {status}")
+            lines.append(f"  {name:25s} {elapsed:6.1f}s  {status}\n")
+    sys.stdout.write("".join(lines))
 
 
 if __name__ == "__main__":